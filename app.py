@@ -12,4 +12,6 @@ def index():
     return "Hello from local VM!"
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=80)
+    # Development server only; in production run under gunicorn:
+    #   gunicorn -c gunicorn.conf.py app:app
+    app.run(host='0.0.0.0', port=80, threaded=True)
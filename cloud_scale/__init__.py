@@ -0,0 +1,4 @@
+"""
+Local load generation, monitoring and managed instance group scaling.
+Submodules are imported on demand; see scaling_to_cloud.py for the entry point.
+"""
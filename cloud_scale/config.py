@@ -0,0 +1,78 @@
+"""
+Configuration loading and the scaling strategy setting.
+"""
+import enum
+import functools
+import os
+import pickle
+import struct
+
+# Cache files start with the source file's mtime (ns) so stale caches are detected
+_MTIME = struct.Struct("<q")
+
+
+class Strategy(enum.Enum):
+    """
+    How the controller uses the managed instance group (scaling.strategy in config).
+    """
+    OFFLOAD = "offload"  # Start remote load on group members and resize the group
+    RESIZE = "resize"    # Only resize the group; members serve work on their own
+
+
+class Policy(enum.Enum):
+    """
+    When the controller decides to scale up (scaling.policy in config).
+    """
+    REACTIVE = "reactive"      # Once smoothed load is over the threshold
+    PREDICTIVE = "predictive"  # Also once the load trend will cross it within the forecast horizon
+
+
+@functools.cache
+def _yaml():
+    """
+    Import yaml on first use; it is only needed when the config cache is stale.
+    """
+    import yaml
+    return yaml
+
+def _cache_path(path):
+    return path + ".cache.pkl"
+
+def load_config(path="config.yaml"):
+    """
+    Load a YAML config file, reusing a pickled copy while the file is unchanged.
+    The cache lives next to the file and is keyed on its modification time.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    cache_path = _cache_path(path)
+    try:
+        with open(cache_path, "rb") as f:
+            header = f.read(_MTIME.size)
+            if len(header) == _MTIME.size and _MTIME.unpack(header)[0] == mtime:
+                return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    yaml = _yaml()
+    # Prefer the libyaml C parser when PyYAML was built with it
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path, "r") as file:
+        config = yaml.load(file, Loader=loader)
+    _write_cache(cache_path, mtime, config)
+    return config
+
+def _write_cache(cache_path, mtime, config):
+    """
+    Atomically replace the cache file; failures only cost the next start a re-parse.
+    """
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_MTIME.pack(mtime))
+            pickle.dump(config, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
@@ -0,0 +1,121 @@
+"""
+Local CPU load generator, used on the controller host and on cloud nodes.
+"""
+import functools
+import logging
+import multiprocessing
+import os
+import time
+
+# Each load worker is its own process meant to occupy one core, so keep BLAS
+# single-threaded; must be set before NumPy is first imported.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+
+logger = logging.getLogger(__name__)
+
+# Target duration of one matrix-multiply burn step; short next to the 0.1s
+# mini-cycle so the busy/idle split stays accurate.
+BURN_STEP_SECONDS = 0.002
+# Niceness added to load workers so the controller wins when both are runnable
+LOAD_WORKER_NICENESS = 5
+# Bounds for the calibrated burn matrix size
+BURN_MATRIX_MIN = 16
+BURN_MATRIX_MAX = 1024
+# Operands for the pure-Python burn step, built once instead of every step
+BURN_RANGE = tuple(range(1000))
+
+@functools.cache
+def _numpy():
+    """
+    Import NumPy on first use, inside the load workers only.
+    Returns None if it is not installed (the pure-Python kernel is used instead).
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+# --------------
+# Unified Load Generator Function (Local)
+# --------------
+def variable_cpu_load(total_duration):
+    """
+    Generate CPU load that ramps up over the first half of the cycle
+    and then ramps down over the second half.
+    This function is used on the local machine.
+    Uses a NumPy kernel when available, otherwise a plain Python loop.
+    """
+    cycle = 0.1  # mini-cycle duration in seconds
+    np = _numpy()
+    if np is not None:
+        # Per-worker matrices: multiplying into a separate output keeps values
+        # finite and runs BLAS's vectorized kernel without holding the GIL.
+        a = _burn_matrix()
+        c = np.empty_like(a)
+
+        def burn():
+            np.dot(a, a, out=c)
+    else:
+        def burn():
+            total = 0
+            for i in BURN_RANGE:
+                total += i * i
+
+    start_time = time.monotonic()
+    while True:
+        elapsed = time.monotonic() - start_time
+        fraction = (elapsed % total_duration) / total_duration
+        # Ramp up in first half, ramp down in second half:
+        intensity = fraction / 0.5 if fraction < 0.5 else (1 - fraction) / 0.5
+        busy_time = cycle * intensity
+        sleep_time = cycle - busy_time
+        # Busy loop to burn CPU cycles until a deadline computed once per mini-cycle;
+        # each burn step is large enough that the clock is read only between steps.
+        deadline = time.monotonic_ns() + int(busy_time * 1e9)
+        while time.monotonic_ns() < deadline:
+            burn()
+        time.sleep(sleep_time)
+
+def _burn_matrix():
+    """
+    Return a random float32 matrix sized so that multiplying it by itself
+    takes about BURN_STEP_SECONDS on this machine.
+    """
+    np = _numpy()
+    n = 64
+    a = np.random.rand(n, n).astype(np.float32)
+    c = np.empty_like(a)
+    np.dot(a, a, out=c)  # Warm up BLAS before timing
+    start = time.perf_counter()
+    np.dot(a, a, out=c)
+    elapsed = max(time.perf_counter() - start, 1e-7)
+    # Matrix multiplication cost grows with the cube of the size.
+    n = int(n * (BURN_STEP_SECONDS / elapsed) ** (1 / 3))
+    n = min(BURN_MATRIX_MAX, max(BURN_MATRIX_MIN, n))
+    return np.random.rand(n, n).astype(np.float32)
+
+def _load_worker(total_duration, cpu):
+    """
+    Load worker process entry point: pin to one CPU, lower priority, then burn.
+    """
+    # A pinned worker is not migrated between cores, which keeps per-core load steady.
+    if cpu is not None:
+        os.sched_setaffinity(0, {cpu})
+    os.nice(LOAD_WORKER_NICENESS)
+    variable_cpu_load(total_duration)
+
+def start_local_load(num_threads, cycle_duration):
+    """
+    Start local load generator workers.
+    Each worker is a separate process so it can occupy a full core; threads
+    would share one interpreter and serialize on the GIL between burn steps.
+    Where supported, worker i is pinned to the i-th allowed CPU (wrapping around).
+    """
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_setaffinity") else None
+    for i in range(num_threads):
+        cpu = cpus[i % len(cpus)] if cpus else None
+        p = multiprocessing.Process(target=_load_worker, args=(cycle_duration, cpu), daemon=True)
+        p.start()
+    logger.info("Started %d local load worker(s) with a %s-second cycle.", num_threads, cycle_duration)
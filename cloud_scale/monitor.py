@@ -0,0 +1,233 @@
+"""
+Local CPU and memory sampling for the scaling controller.
+"""
+import array
+import functools
+import os
+import threading
+import time
+
+# Fewest samples needed before the CPU trend is trusted for forecasting
+MIN_FORECAST_SAMPLES = 10
+
+@functools.cache
+def _psutil():
+    """
+    Import psutil on first use; Linux hosts read /proc directly and never need it.
+    """
+    import psutil
+    return psutil
+
+# --------------
+# Periodic Ticks
+# --------------
+class Ticker:
+    """
+    Wakes up every `interval` seconds on a fixed monotonic schedule.
+    Uses a kernel timerfd where available (Linux, Python 3.13+): the timer is
+    armed once and each tick is a single blocking read. Elsewhere it sleeps
+    until the next deadline.
+    """
+    def __init__(self, interval):
+        self.interval = interval
+        self._fd = None
+        self._woken = threading.Event()
+        if hasattr(os, "timerfd_create"):
+            self._fd = os.timerfd_create(time.CLOCK_MONOTONIC, flags=os.TFD_CLOEXEC)
+            os.timerfd_settime(self._fd, initial=interval, interval=interval)
+        else:
+            self._next_tick = time.monotonic()
+
+    def set_interval(self, interval):
+        """
+        Change the tick period. With a timerfd the next tick is `interval` from now;
+        otherwise it is `interval` after the previous tick.
+        """
+        self.interval = interval
+        if self._fd is not None:
+            os.timerfd_settime(self._fd, initial=interval, interval=interval)
+
+    def wake(self):
+        """
+        End the current wait() early; safe to call from a signal handler.
+        """
+        if self._fd is not None:
+            # Make the timer expire right away; it then resumes its usual period.
+            os.timerfd_settime(self._fd, initial=1e-9, interval=self.interval)
+        else:
+            self._woken.set()
+
+    def wait(self):
+        """
+        Block until the next tick or a wake() call. Ticks missed while the caller
+        was busy are merged into one instead of firing a burst of catch-up ticks.
+        """
+        if self._fd is not None:
+            os.read(self._fd, 8)  # Expiration count; unused
+            return
+        self._next_tick += self.interval
+        now = time.monotonic()
+        if self._next_tick < now:
+            self._next_tick = now
+        self._woken.wait(self._next_tick - now)
+        self._woken.clear()
+
+# --------------
+# Local Metrics Sampling
+# --------------
+class ProcLoadReader:
+    """
+    Reads system-wide CPU and memory usage straight from /proc/stat and
+    /proc/meminfo (Linux), keeping both files open and reading into one reused
+    buffer instead of going through psutil on every sample.
+    """
+    def __init__(self):
+        self._stat_fd = os.open("/proc/stat", os.O_RDONLY)
+        self._meminfo_fd = os.open("/proc/meminfo", os.O_RDONLY)
+        # Only the leading "cpu" line of /proc/stat is needed.
+        self._buf = bytearray(4096)
+        # MemTotal and MemAvailable are the first and third lines of /proc/meminfo.
+        self._meminfo_buf = bytearray(256)
+        self._prev_busy, self._prev_total = self._read_cpu_times()
+
+    def _read_cpu_times(self):
+        n = os.preadv(self._stat_fd, [self._buf], 0)
+        # Aggregate line: "cpu  user nice system idle iowait irq softirq steal guest guest_nice"
+        # Guest time is already counted in user, so only the first eight values are summed.
+        times = list(map(int, self._buf[4:self._buf.find(b"\n", 0, n)].split()[:8]))
+        idle = times[3] + times[4]
+        total = sum(times)
+        return total - idle, total
+
+    def read(self):
+        """
+        Return (cpu percent since the previous read, memory percent in use).
+        """
+        busy, total = self._read_cpu_times()
+        d_total = total - self._prev_total
+        cpu = 100.0 * (busy - self._prev_busy) / d_total if d_total > 0 else 0.0
+        self._prev_busy, self._prev_total = busy, total
+
+        # Searched in place: no copy of the buffer, and MemAvailable follows MemTotal.
+        meminfo = self._meminfo_buf
+        os.preadv(self._meminfo_fd, [meminfo], 0)
+        start = meminfo.find(b"MemTotal:") + 9
+        mem_total = int(meminfo[start:meminfo.find(b"kB", start)])
+        start = meminfo.find(b"MemAvailable:", start) + 13
+        mem_available = int(meminfo[start:meminfo.find(b"kB", start)])
+        # Same definition as psutil.virtual_memory().percent
+        mem = 100.0 * (mem_total - mem_available) / mem_total
+        return cpu, mem
+
+class PsutilLoadReader:
+    """
+    Portable fallback for platforms without /proc.
+    """
+    def __init__(self):
+        # Prime psutil's CPU counters; later non-blocking calls report usage since the previous call.
+        _psutil().cpu_percent(interval=None)
+
+    def read(self):
+        """
+        Return (cpu percent since the previous read, memory percent in use).
+        """
+        psutil = _psutil()
+        return psutil.cpu_percent(interval=None), psutil.virtual_memory().percent
+
+class LoadSampler:
+    """
+    Samples local CPU and memory usage on a background thread into a ring buffer,
+    so readings stay fresh while the controller is blocked on cloud operations.
+    The ring is three parallel float arrays (timestamp, cpu percent, memory
+    percent) written only by the sampler thread; readers take lock-free
+    snapshots guarded by a sequence counter.
+    It also keeps exponentially smoothed CPU and memory, updated on every sample
+    so the smoothing follows the sampling cadence rather than the check interval.
+    """
+    def __init__(self, interval=1.0, history=120, ema_alpha=0.1):
+        self.interval = interval
+        self.history = history
+        self.ema_alpha = ema_alpha
+        self._ema = None  # (cpu, mem), replaced as a whole so readers never see a mix
+        self._times = array.array("d", bytes(8 * history))
+        self._cpu = array.array("d", bytes(8 * history))
+        self._mem = array.array("d", bytes(8 * history))
+        self._count = 0  # Samples written so far; the newest is at (count - 1) % history
+        self._seq = 0    # Odd while the sampler thread is writing a slot
+        self._reader = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """
+        Prime the CPU counters and start sampling.
+        """
+        self._reader = ProcLoadReader() if os.path.exists("/proc/stat") else PsutilLoadReader()
+        self._thread.start()
+
+    def _run(self):
+        ticker = Ticker(self.interval)
+        while True:
+            ticker.wait()
+            cpu, mem = self._reader.read()
+            if self._ema is None:
+                self._ema = (cpu, mem)
+            else:
+                a = self.ema_alpha
+                self._ema = (a * cpu + (1 - a) * self._ema[0], a * mem + (1 - a) * self._ema[1])
+            i = self._count % self.history
+            self._seq += 1
+            self._times[i], self._cpu[i], self._mem[i] = time.monotonic(), cpu, mem
+            self._count += 1
+            self._seq += 1
+            self._ready.set()
+
+    def latest(self):
+        """
+        Return the most recent (timestamp, cpu, mem) sample, waiting for the first one.
+        """
+        self._ready.wait()
+        # The newest slot is not rewritten until `history` more samples arrive.
+        i = (self._count - 1) % self.history
+        return self._times[i], self._cpu[i], self._mem[i]
+
+    def smoothed(self):
+        """
+        Return the exponentially smoothed (cpu, mem), waiting for the first sample.
+        """
+        self._ready.wait()
+        return self._ema
+
+    def _snapshot(self):
+        """
+        Return consistent copies of the timestamp and cpu arrays with the sample count,
+        retrying if the sampler thread wrote a slot while they were being copied.
+        """
+        while True:
+            seq = self._seq
+            if not seq & 1:
+                times, cpu, count = self._times[:], self._cpu[:], self._count
+                if self._seq == seq:
+                    return times, cpu, count
+            time.sleep(0)
+
+    def forecast_cpu(self, horizon):
+        """
+        Extrapolate the least-squares linear CPU trend over the sample history
+        `horizon` seconds past the newest sample. Returns None until enough
+        samples have been collected.
+        """
+        times, cpu, count = self._snapshot()
+        n = min(count, self.history)
+        if n < MIN_FORECAST_SAMPLES:
+            return None
+        # Slots fill from the start, and the fit does not depend on sample order.
+        times, cpu = times[:n], cpu[:n]
+        mean_t = sum(times) / n
+        mean_cpu = sum(cpu) / n
+        var_t = sum((t - mean_t) ** 2 for t in times)
+        cov = sum((t - mean_t) * (c - mean_cpu) for t, c in zip(times, cpu))
+        slope = cov / var_t if var_t > 0 else 0.0
+        newest = times[(count - 1) % self.history]
+        forecast = mean_cpu + slope * (newest - mean_t + horizon)
+        return min(100.0, max(0.0, forecast))
@@ -0,0 +1,67 @@
+"""
+Retry with exponential backoff for transient Google Cloud API errors.
+"""
+import functools
+import logging
+import random
+import time
+
+from google.api_core.exceptions import (
+    BadGateway,
+    GatewayTimeout,
+    InternalServerError,
+    ServiceUnavailable,
+    TooManyRequests,
+)
+
+logger = logging.getLogger(__name__)
+
+# Throttling and transient server-side errors worth retrying
+RETRYABLE_ERRORS = (TooManyRequests, InternalServerError, BadGateway,
+                    ServiceUnavailable, GatewayTimeout)
+
+
+def _is_retryable(e):
+    """
+    Returns True for throttling (429) and transient server-side (5xx) errors.
+    """
+    return isinstance(e, RETRYABLE_ERRORS)
+
+def _retry_after(e):
+    """
+    Returns the server-requested delay in seconds from a Retry-After header, if any.
+    """
+    headers = getattr(getattr(e, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after") or headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+def retry_with_backoff(fn=None, max_retries=5, base=1.0, cap=30.0, jitter=0.5):
+    """
+    Retries fn on transient Google API errors with capped exponential backoff and jitter.
+    Can be applied as @retry_with_backoff, @retry_with_backoff(max_retries=3),
+    or around a single call: retry_with_backoff(migs_client.resize)(...).
+    """
+    if fn is None:
+        return functools.partial(retry_with_backoff, max_retries=max_retries,
+                                 base=base, cap=cap, jitter=jitter)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        for attempt in range(max_retries):
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                if not _is_retryable(e) or attempt == max_retries - 1:
+                    raise
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = base * 2 ** attempt * (1 + random.random() * jitter)
+                delay = min(cap, delay)
+                logger.warning("Transient error from %s (%s); retrying in %.1fs (attempt %d/%d).",
+                               fn.__name__, e, delay, attempt + 1, max_retries)
+                time.sleep(delay)
+    return wrapper
@@ -0,0 +1,647 @@
+"""
+Monitoring loop and managed instance group scaling.
+"""
+import atexit
+import datetime
+import functools
+import logging
+import math
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait as wait_for_futures
+from concurrent.futures import TimeoutError as OperationTimeout
+
+import google.auth
+from google.api_core.exceptions import GoogleAPICallError
+from google.auth.exceptions import GoogleAuthError
+from google.auth.transport.requests import Request
+from google.cloud import compute_v1
+from requests.exceptions import RequestException
+
+from cloud_scale.config import Policy, Strategy
+from cloud_scale.monitor import LoadSampler, Ticker
+from cloud_scale.retry import retry_with_backoff
+from cloud_scale.telemetry import TELEMETRY_PATH, TelemetryRing
+
+logger = logging.getLogger(__name__)
+
+# Errors from an API call that failed or could not reach the API at all:
+# connection failures surface as requests or google-auth errors, not API errors.
+API_ERRORS = (GoogleAPICallError, GoogleAuthError, RequestException)
+
+# Load within this many CPU points of the scale-up threshold keeps polling fast
+STABLE_CPU_MARGIN = 15
+
+# Seconds between checks while waiting for a new cloud node to appear or boot
+NODE_POLL_INTERVAL = 1
+
+# Extra ssh options so repeated gcloud ssh calls to a host share one
+# multiplexed connection instead of redoing the TCP/SSH handshake.
+SSH_MULTIPLEX_FLAGS = (
+    "--ssh-flag=-o ControlMaster=auto",
+    "--ssh-flag=-o ControlPath=/tmp/gssh-%r@%h:%p",
+    "--ssh-flag=-o ControlPersist=600",
+)
+
+# One-liner run on a cloud node to burn CPU cycles in the background
+REMOTE_LOAD_COMMAND = (
+    "nohup python3 -c \"import time, math; "
+    "while True: [math.sqrt(i) for i in range(10000)]; time.sleep(0.1)\" "
+    "> /dev/null 2>&1 &"
+)
+
+# Where the last known instance group size is saved between runs
+STATE_PATH = "/var/run/scaler.state"
+
+# OAuth scope for the controller's credentials (Compute Engine API and gcloud)
+CLOUD_PLATFORM_SCOPE = "https://www.googleapis.com/auth/cloud-platform"
+# Refresh the shared access token once it is this close to expiring
+TOKEN_REFRESH_MARGIN = datetime.timedelta(seconds=60)
+
+# gcloud subprocesses are handed the controller's own access token so each
+# invocation skips loading and refreshing credentials itself.
+_gcloud_token = {"path": None, "token": None, "env": None}
+_gcloud_token_lock = threading.Lock()
+
+# Variables passed on to gcloud (besides CLOUDSDK_*); the rest of the
+# controller's environment is not copied into each child. The proxy settings
+# are needed for gcloud's own API calls (OS Login, key upload) behind a proxy.
+GCLOUD_ENV_VARS = frozenset({
+    "HOME", "PATH", "USER", "LANG", "SSH_AUTH_SOCK",
+    "HTTP_PROXY", "HTTPS_PROXY", "NO_PROXY", "http_proxy", "https_proxy", "no_proxy",
+})
+
+# --------------
+# Cloud API Helpers
+# --------------
+@functools.cache
+def _gcloud_executable():
+    """
+    Return gcloud's full path, looked up once. subprocess only uses posix_spawn
+    for an executable given with a directory, not for a bare name.
+    """
+    return shutil.which("gcloud") or "gcloud"
+
+@functools.cache
+def _gcloud_base_env():
+    """
+    Return the minimal environment gcloud and ssh need, built once.
+    """
+    return {k: v for k, v in os.environ.items()
+            if k in GCLOUD_ENV_VARS or k.startswith("CLOUDSDK_")}
+
+def gcloud_env(credentials):
+    """
+    Return the environment for gcloud subprocesses, pointing gcloud at a file with
+    the controller's access token. The token is refreshed only when it is about to
+    expire. Falls back to gcloud's own credentials if it cannot be refreshed.
+    """
+    with _gcloud_token_lock:
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        if not credentials.valid or (credentials.expiry is not None
+                                     and credentials.expiry - now < TOKEN_REFRESH_MARGIN):
+            try:
+                credentials.refresh(Request())
+            except GoogleAuthError as e:  # RefreshError, or TransportError on network failure
+                logger.warning("Could not refresh access token for gcloud: %s", e)
+                return _gcloud_base_env()
+        if credentials.token != _gcloud_token["token"]:
+            if _gcloud_token["path"] is None:
+                # A private (0700) directory, so no other user can plant a file or
+                # symlink at the token path or its temporary file.
+                token_dir = tempfile.mkdtemp(prefix="gcloud-token-")
+                atexit.register(shutil.rmtree, token_dir, ignore_errors=True)
+                _gcloud_token["path"] = os.path.join(token_dir, "token")
+                _gcloud_token["env"] = dict(_gcloud_base_env(),
+                                            CLOUDSDK_AUTH_ACCESS_TOKEN_FILE=_gcloud_token["path"])
+            # Replace the file atomically so concurrent gcloud calls never see a partial token.
+            tmp_path = _gcloud_token["path"] + ".tmp"
+            with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+                f.write(credentials.token)
+            os.replace(tmp_path, _gcloud_token["path"])
+            _gcloud_token["token"] = credentials.token
+        return _gcloud_token["env"]
+
+def wait_for_operation(operation, timeout=300):
+    """
+    Block until a Compute Engine operation completes.
+    Returns True on success, False on error or timeout.
+    """
+    if operation is None:
+        return False
+    try:
+        operation.result(timeout=timeout)
+    except (GoogleAPICallError, OperationTimeout) as e:
+        logger.error("Operation did not complete successfully: %s", e)
+        return False
+    return True
+
+def _log_scaling_failure(future):
+    """
+    Done-callback for background scaling actions: report any uncaught error.
+    """
+    if future.exception() is not None:
+        logger.error("Scaling action failed: %s", future.exception())
+
+# --------------
+# Monitoring & Scaling Controller
+# --------------
+class Controller:
+    """
+    Watches local CPU and memory and shares load with a managed instance group,
+    resizing it between the configured minimum and maximum size. With the offload
+    strategy, idle group members also get remote load started on them.
+    """
+    def __init__(self, config):
+        instance = config["instance"]
+        thresholds = config.get("thresholds", {})
+        scaling = config.get("scaling", {})
+
+        # Google Cloud instance group
+        self.instance_group_name = instance["name"]
+        self.zone = instance["zone"]
+        # Zones holding a same-named standby group that mirrors this group's size
+        self.replica_zones = instance.get("replica_zones", [])
+        self.project = instance["project"]
+
+        # Thresholds for scaling decisions (for the overall cluster)
+        self.cpu_scale_up_threshold = thresholds.get("cpu_up", 75)      # Local CPU above this triggers offloading/scale up
+        self.mem_scale_up_threshold = thresholds.get("mem_up", 90)      # Local memory above this triggers offloading/scale up
+        self.cpu_scale_down_threshold = thresholds.get("cpu_down", 50)  # Local CPU below this allows scale down
+        self.mem_scale_down_threshold = thresholds.get("mem_down", 50)  # Local memory below this allows scale down
+        self.ema_alpha = thresholds.get("ema_alpha", 0.1)               # Weight of each new sample (every sample_interval)
+        self.scale_up_checks = thresholds.get("up_checks", 3)           # Consecutive checks above cpu_up/mem_up to scale up
+        self.scale_down_checks = thresholds.get("down_checks", 5)       # Consecutive checks below cpu_down/mem_down to scale down
+
+        # Instance group limits and pacing
+        self.max_instances = scaling.get("max_instances", 5)
+        self.min_instances = scaling.get("min_instances", 1)            # Always keep at least this many cloud nodes
+        self.scale_cooldown = scaling.get("cooldown", 60)               # Seconds between scaling actions
+        self.strategy = Strategy(scaling.get("strategy", Strategy.OFFLOAD.value))
+        self.policy = Policy(scaling.get("policy", Policy.REACTIVE.value))
+        # Seconds ahead the predictive policy looks, roughly a new node's boot time
+        self.forecast_horizon = scaling.get("forecast_horizon", 60)
+
+        self.check_interval = instance.get("check_interval", 5)         # Seconds between resource checks
+        # Upper bound for the check interval while the cluster is stable
+        self.max_check_interval = instance.get("max_check_interval", 60)
+
+        self.state_path = instance.get("state_path", STATE_PATH)
+        # active_instances holds the names of cloud nodes that are currently "sharing load".
+        # It is used as an ordered set (values unused) so the newest node is O(1) to find.
+        self.active_instances = {}
+
+        # Compute Engine API clients, created once so every call reuses the same
+        # authenticated session instead of spawning a gcloud subprocess.
+        # The clients are thread-safe and shared with remote_pool's workers.
+        # Both use one set of credentials, so the token is refreshed once for all
+        # of them and is also what gcloud ssh gets (see gcloud_env).
+        self.credentials, _ = google.auth.default(scopes=[CLOUD_PLATFORM_SCOPE])
+        self.instances_client = compute_v1.InstancesClient(credentials=self.credentials)
+        self.migs_client = compute_v1.InstanceGroupManagersClient(credentials=self.credentials)
+
+        # Local CPU/memory readings, collected independently of the scaling work.
+        self.sampler = LoadSampler(interval=instance.get("sample_interval", 1.0),
+                                   ema_alpha=self.ema_alpha)
+        # Per-check readings go to a binary ring buffer; the text log line is debug only.
+        self.telemetry = TelemetryRing(instance.get("telemetry_path", TELEMETRY_PATH))
+
+        # Worker pool for bringing several cloud nodes into service concurrently.
+        self.remote_pool = ThreadPoolExecutor(max_workers=self.max_instances)
+        # Single worker that runs scale_up/scale_down off the monitoring loop.
+        self.scale_pool = ThreadPoolExecutor(max_workers=1)
+        # Replica group resizes, issued alongside the primary resize rather than after it.
+        self.replica_pool = ThreadPoolExecutor(max_workers=max(1, len(self.replica_zones)))
+
+        # Set by stop(); run() returns at its next check.
+        self.stop_event = threading.Event()
+        self.ticker = None
+
+        # Arguments that never change between calls, built once here so each call
+        # only adds the per-call parts (instance name, new size).
+        self.mig_request = {
+            "project": self.project,
+            "zone": self.zone,
+            "instance_group_manager": self.instance_group_name,
+        }
+        self.ssh_options = (f"--zone={self.zone}", *SSH_MULTIPLEX_FLAGS,
+                            "--command", REMOTE_LOAD_COMMAND)
+
+        # current_size is the instance group's size, read back at startup so a
+        # restarted controller does not resize from a wrong baseline.
+        self.current_size = self.fetch_group_size()
+        logger.info("Instance group '%s' has %d cloud node(s).", self.instance_group_name, self.current_size)
+        if self.strategy is Strategy.OFFLOAD:
+            self.adopt_group_members()
+
+    # --------------
+    # Remote Load Functions (for Cloud Nodes)
+    # --------------
+    def wait_for_instance(self, instance_name, timeout=300):
+        """
+        Wait until the given instance's status is RUNNING.
+        """
+        start_time = time.time()
+        while time.time() - start_time < timeout:
+            try:
+                status = self.instances_client.get(
+                    project=self.project, zone=self.zone, instance=instance_name
+                ).status
+            except API_ERRORS as e:
+                logger.error("Error describing instance %s: %s", instance_name, e)
+                status = None
+            if status == "RUNNING":
+                logger.info("Instance %s is RUNNING.", instance_name)
+                return True
+            time.sleep(NODE_POLL_INTERVAL)
+        return False
+
+    def start_remote_load(self, instance_name):
+        """
+        Remotely start a load generator on the cloud instance.
+        We use a one-liner that burns CPU cycles directly on the remote node.
+        Returns True if the remote command was started.
+        """
+        cmd = (_gcloud_executable(), "compute", "ssh", instance_name, *self.ssh_options)
+        try:
+            # Output is kept as raw bytes and only decoded when reporting a failure.
+            # Our own fds are non-inheritable, so close_fds=False is safe; together with
+            # the full executable path it lets subprocess spawn gcloud with posix_spawn.
+            subprocess.run(cmd, check=True, env=gcloud_env(self.credentials), close_fds=False,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            logger.info("Started remote load on instance: %s", instance_name)
+            return True
+        except subprocess.CalledProcessError as e:
+            logger.error("Error starting remote load on %s: %s\n%s", instance_name, e,
+                         e.stderr.decode(errors="replace").strip())
+            return False
+
+    def activate_node(self, instance_name):
+        """
+        Wait for a cloud node to be RUNNING, then start remote load on it.
+        Returns True if the node is now sharing load.
+        """
+        if not self.wait_for_instance(instance_name):
+            logger.warning("Cloud node %s not ready for load offloading.", instance_name)
+            return False
+        return self.start_remote_load(instance_name)
+
+    def activate_nodes(self, instance_names):
+        """
+        Activate several cloud nodes concurrently.
+        Returns the names of the nodes that were successfully activated.
+        """
+        futures = {name: self.remote_pool.submit(self.activate_node, name) for name in instance_names}
+        # Collect each node on its own, so one failure cannot hide nodes that did activate.
+        activated = []
+        for name, future in futures.items():
+            try:
+                if future.result():
+                    activated.append(name)
+            except Exception as e:
+                logger.error("Error activating cloud node %s: %s", name, e)
+        return activated
+
+    @retry_with_backoff
+    def get_instance_names(self):
+        """
+        Return a set of instance names currently in the managed instance group.
+        """
+        response = self.migs_client.list_managed_instances(**self.mig_request)
+        # Each entry carries the full instance URL; keep only the trailing name.
+        return frozenset(i.instance.split("/")[-1] for i in response)
+
+    def adopt_group_members(self):
+        """
+        Treat the group's current members as sharing load. Remote load started by
+        a previous run keeps running on them, so after a restart they must be
+        tracked (and not offloaded to a second time) for scale_down to remove them.
+        """
+        try:
+            members = self.get_instance_names()
+        except API_ERRORS as e:
+            logger.warning("Could not list instance group members: %s", e)
+            return
+        self.active_instances.update(dict.fromkeys(sorted(members)))
+
+    def fetch_group_size(self):
+        """
+        Return the instance group's target size from the API, falling back to the
+        size saved by the previous run and then to min_instances.
+        """
+        try:
+            return retry_with_backoff(self.migs_client.get)(**self.mig_request).target_size
+        except API_ERRORS as e:
+            logger.warning("Could not read instance group size: %s", e)
+        try:
+            with open(self.state_path) as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return self.min_instances
+
+    def set_size(self, size):
+        """
+        Record the instance group size and atomically save it for the next run.
+        """
+        self.current_size = size
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(str(size))
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            logger.warning("Could not save instance group size to %s: %s", self.state_path, e)
+
+    def scale_instance_group(self, new_size):
+        """
+        Resize the managed instance group to new_size.
+        Returns the resize operation, or None if the request was rejected.
+        """
+        logger.info("Resizing instance group '%s' to %d instances in zone %s...",
+                    self.instance_group_name, new_size, self.zone)
+        try:
+            operation = retry_with_backoff(self.migs_client.resize)(**self.mig_request, size=new_size)
+        except GoogleAPICallError as e:
+            logger.error("Error resizing instance group: %s", e)
+            return None
+        # Replicas follow only once the primary resize has been accepted, so they
+        # never drift to a size the primary group was refused.
+        self.resize_replicas(new_size)
+        return operation
+
+    def delete_instances(self, instance_names):
+        """
+        Delete specific members of the managed instance group; its target size
+        shrinks by the same number. Returns the operation, or None if rejected.
+        """
+        request = compute_v1.InstanceGroupManagersDeleteInstancesRequest(
+            instances=[f"zones/{self.zone}/instances/{name}" for name in instance_names])
+        try:
+            return retry_with_backoff(self.migs_client.delete_instances)(
+                **self.mig_request, instance_group_managers_delete_instances_request_resource=request)
+        except API_ERRORS as e:
+            logger.error("Error deleting instances from instance group: %s", e)
+            return None
+
+    def resize_replicas(self, new_size):
+        """
+        Resize every replica group to new_size in the background, one worker per zone.
+        """
+        for zone in self.replica_zones:
+            self.replica_pool.submit(self.resize_replica, zone, new_size).add_done_callback(_log_scaling_failure)
+
+    def resize_replica(self, zone, new_size):
+        """
+        Resize the standby group in another zone and wait for it to finish.
+        Returns True on success.
+        """
+        try:
+            operation = retry_with_backoff(self.migs_client.resize)(
+                **dict(self.mig_request, zone=zone), size=new_size)
+        except GoogleAPICallError as e:
+            logger.error("Error resizing instance group in zone %s: %s", zone, e)
+            return False
+        return wait_for_operation(operation)
+
+    # --------------
+    # Monitoring Loop
+    # --------------
+    def run(self):
+        """
+        Sequence:
+          1. Run local load.
+          2. When local CPU or memory exceeds its scale-up threshold, check if a cloud node is available.
+             - If a cloud node is available but not yet running load, remotely start load on it.
+             - Otherwise, if no cloud node is available, scale up the instance group (up to max_instances).
+          3. As load further increases, keep scaling up until max_instances cloud nodes share the load.
+          4. Once load drops below both scale-down thresholds, scale down one cloud node
+             at a time (ensuring min_instances remain) until local load is below threshold.
+          5. Continually log the total (local) CPU and Memory usage.
+        """
+        self.sampler.start()
+
+        poll_interval = self.check_interval
+        last_scale_ts = float("-inf")
+        # At most one scaling action runs at a time, on scale_pool, so sampling and
+        # logging carry on while it waits on the cloud.
+        inflight = None
+        up_streak = down_streak = 0
+        # Checks run on a fixed monotonic schedule, so the time spent in an iteration
+        # does not push later checks back.
+        self.ticker = ticker = Ticker(poll_interval)
+        while not self.stop_event.is_set():
+            # Use the freshest background sample rather than measuring inline.
+            _, cpu_usage, mem_usage = self.sampler.latest()
+            # Scaling decisions use exponentially smoothed values, not the raw sample.
+            # The sampler smooths every sample, so this does not depend on the poll interval.
+            cpu_ema, mem_ema = self.sampler.smoothed()
+            self.telemetry.append(cpu_usage, mem_usage, self.current_size)
+            logger.debug("Local CPU: %.1f%% (avg %.1f%%) | Memory: %.1f%% (avg %.1f%%) | Cloud nodes: %d",
+                         cpu_usage, cpu_ema, mem_usage, mem_ema, self.current_size)
+            above_up = cpu_ema > self.cpu_scale_up_threshold or mem_ema > self.mem_scale_up_threshold
+            # The predictive policy also scales up ahead of a rising trend; the reactive
+            # rule above still applies, and sizing uses whichever load is higher.
+            cpu_load = cpu_ema
+            if self.policy is Policy.PREDICTIVE:
+                cpu_forecast = self.sampler.forecast_cpu(self.forecast_horizon)
+                if cpu_forecast is not None:
+                    logger.debug("CPU forecast in %ss: %.1f%%", self.forecast_horizon, cpu_forecast)
+                    above_up = above_up or cpu_forecast > self.cpu_scale_up_threshold
+                    cpu_load = max(cpu_load, cpu_forecast)
+            below_down = cpu_ema < self.cpu_scale_down_threshold and mem_ema < self.mem_scale_down_threshold
+            # Only act once the smoothed load has stayed past a threshold for several checks.
+            up_streak = up_streak + 1 if above_up else 0
+            down_streak = down_streak + 1 if below_down else 0
+            scale_up_needed = up_streak >= self.scale_up_checks
+            scale_down_needed = down_streak >= self.scale_down_checks
+
+            # --- Collect a finished background scaling action ---
+            action_finished = inflight is not None and inflight.done()
+            if action_finished:
+                # The cool-down runs from when the action took effect, not when it started.
+                if inflight.exception() is None and inflight.result():
+                    last_scale_ts = time.monotonic()
+                inflight = None
+            cooldown_left = self.scale_cooldown - (time.monotonic() - last_scale_ts)
+
+            # --- A scaling action is still running ---
+            if inflight is not None:
+                logger.debug("Scaling action in progress; no new action taken.")
+
+            # --- Cool-down after the previous scaling action ---
+            elif (scale_up_needed or scale_down_needed) and cooldown_left > 0:
+                logger.debug("Scaling cool-down in effect (%.0fs left); no action taken.", cooldown_left)
+
+            # --- Scaling Up or Offloading Load ---
+            elif scale_up_needed:
+                inflight = self.scale_pool.submit(self.scale_up, cpu_load)
+                inflight.add_done_callback(_log_scaling_failure)
+                up_streak = down_streak = 0
+
+            # --- Scaling Down ---
+            elif scale_down_needed:
+                inflight = self.scale_pool.submit(self.scale_down)
+                inflight.add_done_callback(_log_scaling_failure)
+                up_streak = down_streak = 0
+
+            # Adapt the check interval: poll fast around thresholds and scaling activity,
+            # back off (doubling up to max_check_interval) while the cluster is stable.
+            # The raw sample counts too, so a spike is noticed before the average catches up.
+            raw_above_up = cpu_usage > self.cpu_scale_up_threshold or mem_usage > self.mem_scale_up_threshold
+            # Below the scale-down thresholds the down_checks streak is building, unless
+            # the group is already at its minimum and there is nothing to scale down.
+            can_scale_down = below_down and self.current_size > self.min_instances
+            if above_up or raw_above_up or can_scale_down or inflight is not None or action_finished:
+                poll_interval = self.check_interval
+            elif abs(cpu_ema - self.cpu_scale_up_threshold) > STABLE_CPU_MARGIN:
+                poll_interval = min(poll_interval * 2, self.max_check_interval)
+
+            if poll_interval != ticker.interval:
+                ticker.set_interval(poll_interval)
+            ticker.wait()
+
+        # Let a scaling action that already started finish, so no resize is left half-done.
+        if inflight is not None and not inflight.done():
+            logger.info("Waiting for the in-flight scaling action to finish before exiting...")
+            wait_for_futures([inflight])
+        logger.info("Controller stopped.")
+
+    def stop(self):
+        """
+        Ask run() to return after its current check; safe to call from a signal handler.
+        """
+        self.stop_event.set()
+        if self.ticker is not None:
+            self.ticker.wake()
+
+    def scale_up(self, cpu_load):
+        """
+        Offload to idle cloud nodes if there are any, otherwise grow the group
+        by enough nodes to bring cpu_load back under the scale-up threshold.
+        Returns True if a scaling action was attempted.
+        """
+        if self.strategy is Strategy.RESIZE:
+            return self._resize_up(cpu_load)
+
+        # Check if there is any available cloud node (from instance group) that is not yet sharing load.
+        instance_names = self.get_instance_names()
+        available_nodes = [n for n in instance_names if n not in self.active_instances]
+        if available_nodes:
+            # Offload: start remote load on every available cloud node in parallel.
+            logger.info("Offloading load to available cloud node(s): %s", ", ".join(sorted(available_nodes)))
+            self.active_instances.update(dict.fromkeys(self.activate_nodes(available_nodes)))
+            # Update current_size if needed.
+            if len(self.active_instances) > self.current_size:
+                self.set_size(len(self.active_instances))
+            return True
+
+        # No available node found – scale up if not at maximum.
+        if self.current_size >= self.max_instances:
+            logger.debug("Maximum cloud nodes reached. Load offloading is already in effect.")
+            return False
+
+        desired_size = self._desired_size(cpu_load)
+        expected_new = desired_size - self.current_size
+        before_nodes = instance_names
+        operation = self.scale_instance_group(desired_size)
+        resized = wait_for_operation(operation)
+
+        # The group lists new members as soon as the resize operation
+        # completes, so this short poll only covers listing propagation.
+        new_nodes = set()
+        timeout = 300  # seconds to wait for new node detection
+        start_wait = time.time()
+        while resized and time.time() - start_wait < timeout:
+            # The resize has been accepted, so a failed listing must not end scale_up
+            # before the new size is recorded; keep polling instead.
+            try:
+                new_nodes = self.get_instance_names() - before_nodes
+            except API_ERRORS as e:
+                logger.warning("Error listing instance group members: %s", e)
+            else:
+                if len(new_nodes) >= expected_new:
+                    break
+            time.sleep(NODE_POLL_INTERVAL)
+
+        if not new_nodes:
+            logger.warning("No new cloud node detected after scaling up. Reverting scale-up.")
+            self.scale_instance_group(self.current_size)
+            return True
+
+        logger.info("New cloud node(s) detected: %s. Waiting for them to be ready...", ", ".join(sorted(new_nodes)))
+        activated = self.activate_nodes(new_nodes)
+        self.active_instances.update(dict.fromkeys(activated))
+        # The group now targets desired_size, including any new nodes that never showed
+        # up in the listing (they stay in the group and are offloaded to later).
+        group_size = desired_size
+        # Delete exactly the nodes that failed; a plain resize would let the group
+        # pick which VMs to remove, possibly ones that were just activated.
+        failed_nodes = new_nodes.difference(activated)
+        if failed_nodes:
+            logger.warning("Cloud node(s) did not become ready: %s. Deleting them.",
+                           ", ".join(sorted(failed_nodes)))
+            if wait_for_operation(self.delete_instances(failed_nodes)):
+                group_size -= len(failed_nodes)
+                self.resize_replicas(group_size)
+        self.set_size(group_size)
+        return True
+
+    def _desired_size(self, cpu_load):
+        """
+        Size the group in proportion to how far load is over the threshold, so a
+        large spike is absorbed by one resize instead of one node per cycle.
+        """
+        return min(self.max_instances, max(
+            self.current_size + 1,
+            math.ceil(self.current_size * cpu_load / self.cpu_scale_up_threshold)
+        ))
+
+    def _resize_up(self, cpu_load):
+        """
+        Resize strategy: grow the group without starting remote load on its members.
+        """
+        if self.current_size >= self.max_instances:
+            logger.debug("Maximum cloud nodes reached.")
+            return False
+        desired_size = self._desired_size(cpu_load)
+        if wait_for_operation(self.scale_instance_group(desired_size)):
+            self.set_size(desired_size)
+        return True
+
+    def scale_down(self):
+        """
+        Remove one cloud node from sharing load and shrink the group.
+        Returns True if a node was removed.
+        """
+        if self.current_size <= self.min_instances:
+            logger.debug("At minimum cloud node count; cannot scale down further.")
+            return False
+        if self.strategy is Strategy.RESIZE:
+            if not wait_for_operation(self.scale_instance_group(self.current_size - 1)):
+                return False
+            self.set_size(self.current_size - 1)
+            return True
+        if not self.active_instances:
+            # Members could not be listed at startup; try again before giving up.
+            self.adopt_group_members()
+        if not self.active_instances:
+            logger.debug("No active cloud node to remove, though scale down conditions met.")
+            return False
+        # Remove one cloud node from sharing load.
+        node_to_remove = next(reversed(self.active_instances))
+        desired_size = self.current_size - 1
+        # Delete this exact node; a plain resize would let the group choose the VM.
+        logger.info("Scaling down: Removing cloud node %s.", node_to_remove)
+        if not wait_for_operation(self.delete_instances([node_to_remove])):
+            logger.warning("Scale-down did not complete; keeping cloud node %s.", node_to_remove)
+            return False
+        del self.active_instances[node_to_remove]
+        self.set_size(desired_size)
+        self.resize_replicas(desired_size)
+        return True
+
@@ -0,0 +1,74 @@
+"""
+Binary telemetry ring buffer shared with external readers through mmap.
+"""
+import logging
+import mmap
+import os
+import stat
+import struct
+import time
+
+logger = logging.getLogger(__name__)
+
+# Default location: tmpfs, so writes never touch the disk
+TELEMETRY_PATH = "/dev/shm/scaler.log"
+TELEMETRY_SIZE = 64 * 1024
+
+# Header: magic, record size, record capacity, total records written so far.
+# The newest record is at index (count - 1) % capacity.
+_HEADER = struct.Struct("<4sIIQ")
+_MAGIC = b"SCLR"
+_COUNT = struct.Struct("<Q")
+_COUNT_OFFSET = _HEADER.size - _COUNT.size
+# Record: timestamp (ns since the epoch), cpu percent, memory percent, cloud nodes
+_RECORD = struct.Struct("<qffI")
+
+
+class TelemetryRing:
+    """
+    Fixed-size ring of (timestamp_ns, cpu, mem, nodes) records in a memory-mapped
+    file. Appending is a pack into the mapping with no system call; tools can map
+    the same file read-only and follow the write count in the header.
+    Falls back to anonymous memory if the file cannot be created, is a symlink,
+    or belongs to another user (the default directory is world-writable).
+    """
+    def __init__(self, path=TELEMETRY_PATH, size=TELEMETRY_SIZE):
+        self.capacity = (size - _HEADER.size) // _RECORD.size
+        self.path = path
+        try:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o644)
+            try:
+                st = os.fstat(fd)
+                if not stat.S_ISREG(st.st_mode) or st.st_uid != os.geteuid():
+                    raise PermissionError(f"not a regular file owned by uid {os.geteuid()}")
+                # Truncate only once the file is known to be ours, then clear it.
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, size)
+                self._buf = mmap.mmap(fd, size)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.warning("Telemetry file %s unavailable (%s); keeping telemetry in memory only.", path, e)
+            self.path = None
+            self._buf = mmap.mmap(-1, size)
+        self._count = 0
+        _HEADER.pack_into(self._buf, 0, _MAGIC, _RECORD.size, self.capacity, 0)
+
+    def append(self, cpu, mem, nodes):
+        """
+        Record one reading, overwriting the oldest once the ring is full.
+        """
+        offset = _HEADER.size + (self._count % self.capacity) * _RECORD.size
+        _RECORD.pack_into(self._buf, offset, time.time_ns(), cpu, mem, nodes)
+        # Publish the count only after the record is in place.
+        self._count += 1
+        _COUNT.pack_into(self._buf, _COUNT_OFFSET, self._count)
+
+    def records(self):
+        """
+        Return the buffered records, oldest first.
+        """
+        count = _COUNT.unpack_from(self._buf, _COUNT_OFFSET)[0]
+        first = max(0, count - self.capacity)
+        return [_RECORD.unpack_from(self._buf, _HEADER.size + (i % self.capacity) * _RECORD.size)
+                for i in range(first, count)]
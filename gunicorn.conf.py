@@ -0,0 +1,14 @@
+# gunicorn.conf.py
+# Production server settings for app.py: gunicorn -c gunicorn.conf.py app:app
+import multiprocessing
+
+bind = "0.0.0.0:80"
+
+# One worker process per core, each serving requests from a thread pool so the
+# blocking handler does not cap throughput at one request per second.
+workers = multiprocessing.cpu_count()
+worker_class = "gthread"
+threads = 64
+
+# Keep client connections open between requests instead of re-handshaking.
+keepalive = 5